@@ -2,42 +2,111 @@
 
 Usage:
     python get_pdf_table_cell.py <file.pdf> <row> <col>
+    python get_pdf_table_cell.py <file.pdf> --repl
+
+With --repl the document is parsed once and each stdin line "<row> <col>"
+is answered in turn, which avoids paying startup and parse per lookup.
 
 Example:
     python get_pdf_table_cell.py invoice.pdf 1 0
+    printf "1 0\n2 3\n" | python get_pdf_table_cell.py invoice.pdf --repl
 """
 
+from __future__ import annotations
+
+import html
 import re
 import sys
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from landingai_ade import LandingAIADE
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from landingai_ade import LandingAIADE
+
+# Cell bodies are matched as "runs of non-'<' text, plus any '<' that does not
+# start the closing tag" rather than a lazy (.*?); it matches the same text
+# but avoids re-testing the closing tag at every character
+_TR_RE = re.compile(r'<tr[^>]*>([^<]*(?:<(?!/tr>)[^<]*)*)</tr>')
+_TD_RE = re.compile(r'<td[^>]*>([^<]*(?:<(?!/td>)[^<]*)*)</td>')
+_TAG_RE = re.compile(r'<[^>]+>')
+
+def _clean(cell_html: str) -> str:
+    # Most cells are plain text, so only run the tag-strip regex when needed.
+    # Whitespace is stripped after decoding so &nbsp; padding goes too.
+    text = cell_html
+    if "<" in text:
+        text = _TAG_RE.sub('', text)
+    return html.unescape(text).strip()
+
+@lru_cache(maxsize=1)
+def _get_client() -> "LandingAIADE":
+    # Imported here so that printing usage does not load the SDK
+    from landingai_ade import LandingAIADE
+
+    return LandingAIADE()
+
+@lru_cache(maxsize=32)
+def _cached_parse(path_str: str, mtime_ns: int):
+    return _get_client().parse(document=Path(path_str))
+
+def parse_cached(file_path: str):
+    path = Path(file_path).resolve()
+    return _cached_parse(str(path), path.stat().st_mtime_ns)
+
+def _tables_from(response, limit: int | None = None) -> list:
+    return list(islice((c for c in response.chunks if c.type == "table"), limit))
 
 def get_pdf_cell(file_path: str, row: int, col: int, table_index: int = 0) -> str:
-    client = LandingAIADE()
-    response = client.parse(document=Path(file_path))
+    # Only the chunks up to the requested table are needed; if there are
+    # fewer, the whole list was consumed and the count in the error is exact.
+    # Negative indexes count from the end, so they need every table.
+    limit = table_index + 1 if table_index >= 0 else None
+    tables = _tables_from(parse_cached(file_path), limit=limit)
+    return get_pdf_cell_from_tables(tables, row, col, table_index)
 
-    tables = [c for c in response.chunks if c.type == "table"]
+def get_pdf_cell_from_tables(tables: list, row: int, col: int, table_index: int = 0) -> str:
     if not tables:
         raise ValueError("No tables found in document")
     if table_index >= len(tables):
         raise ValueError(f"Table index {table_index} out of range ({len(tables)} tables found)")
     table = tables[table_index]
 
-    # Parse HTML rows and cells into a (row, col) grid
-    rows = re.findall(r'<tr[^>]*>(.*?)</tr>', table.markdown, re.DOTALL)
-    grid = {}
-    for r, row_html in enumerate(rows):
-        for c, m in enumerate(re.finditer(
-            r'<td[^>]*>(.*?)</td>', row_html, re.DOTALL
-        )):
-            grid[(r, c)] = re.sub(r'<[^>]+>', '', m.group(1)).strip()
+    # Walk HTML rows only as far as the requested one, then index its cells
+    for r, m in enumerate(_TR_RE.finditer(table.markdown)):
+        if r == row:
+            cells = _TD_RE.findall(m.group(1))
+            if 0 <= col < len(cells):
+                return _clean(cells[col])
+            break
+
+    raise KeyError(f"No cell at ({row}, {col}). Available: {_cell_positions(table.markdown)}")
 
-    if (row, col) not in grid:
-        raise KeyError(f"No cell at ({row}, {col}). Available: {sorted(grid.keys())}")
+def _cell_positions(markdown: str) -> list[tuple[int, int]]:
+    return [
+        (r, c)
+        for r, row_html in enumerate(_TR_RE.findall(markdown))
+        for c in range(len(_TD_RE.findall(row_html)))
+    ]
 
-    return grid[(row, col)]
+def _repl(file_path: str) -> None:
+    tables = _tables_from(parse_cached(file_path))
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            row, col = map(int, line.split())
+            value = get_pdf_cell_from_tables(tables, row, col)
+        except (ValueError, KeyError) as e:
+            print(f"Error: {e}", file=sys.stderr, flush=True)
+            continue
+        print(f"Row {row}, Col {col}: {value}", flush=True)
 
 if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[2] == "--repl":
+        _repl(sys.argv[1])
+        sys.exit(0)
     if len(sys.argv) < 4:
         print(__doc__)
         sys.exit(1)
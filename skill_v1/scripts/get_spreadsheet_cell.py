@@ -2,44 +2,134 @@
 
 Usage:
     python get_spreadsheet_cell.py <file.xlsx> <cell_id>
+    python get_spreadsheet_cell.py <file.xlsx> --repl
+
+With --repl the spreadsheet is parsed once and each stdin line is looked up
+as a cell ID, which avoids paying startup and parse per lookup.
 
 Example:
     python get_spreadsheet_cell.py report.xlsx "Sheet 1-B2"
+    printf "Sheet 1-B2\nSheet 1-C4\n" | python get_spreadsheet_cell.py report.xlsx --repl
 """
 
+from __future__ import annotations
+
+import html
 import re
 import sys
+from functools import lru_cache
+from itertools import chain, islice
 from pathlib import Path
-from landingai_ade import LandingAIADE
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from landingai_ade import LandingAIADE
+
+_TD_ID_ONLY_RE = re.compile(r'<td[^>]*\bid=["\']([^"\']+)["\']')
+_TAG_RE = re.compile(r"<[^>]+>")
+
+def _clean(cell_html: str) -> str:
+    # Most cells are plain text, so only run the tag-strip regex when needed.
+    # Whitespace is stripped after decoding so &nbsp; padding goes too.
+    text = cell_html
+    if "<" in text:
+        text = _TAG_RE.sub("", text)
+    return html.unescape(text).strip()
+
+@lru_cache(maxsize=1)
+def _get_client() -> "LandingAIADE":
+    # Imported here so that printing usage does not load the SDK
+    from landingai_ade import LandingAIADE
+
+    return LandingAIADE()
+
+@lru_cache(maxsize=32)
+def _cached_parse(path_str: str, mtime_ns: int):
+    return _get_client().parse(document=Path(path_str))
+
+def parse_cached(file_path: str):
+    path = Path(file_path).resolve()
+    return _cached_parse(str(path), path.stat().st_mtime_ns)
+
+@lru_cache(maxsize=32)
+def _cached_sheet_index(path_str: str, mtime_ns: int) -> dict[str, list]:
+    response = _cached_parse(path_str, mtime_ns)
+    return index_sheets([c for c in response.chunks if c.type == "table"])
+
+def sheet_index(file_path: str) -> dict[str, list]:
+    path = Path(file_path).resolve()
+    return _cached_sheet_index(str(path), path.stat().st_mtime_ns)
+
+def index_sheets(tables: list) -> dict[str, list]:
+    # Cell IDs are "{tab_name}-{cell_ref}", so the first ID in a table chunk
+    # names the sheet it belongs to
+    sheets = {}
+    for table in tables:
+        m = _TD_ID_ONLY_RE.search(table.markdown)
+        name = m.group(1).rpartition("-")[0] if m else ""
+        sheets.setdefault(name, []).append(table)
+    return sheets
+
+def _find_cell_html(markdown: str, cell_id: str) -> str | None:
+    # Locate the id attribute by plain substring search and slice out the
+    # cell body up to the next </td>, rather than regex-matching every cell
+    for quote in "\"'":
+        needle = f"id={quote}{cell_id}{quote}"
+        i = markdown.find(needle)
+        while i >= 0:
+            tag_start = markdown.rfind("<", 0, i)
+            in_td_tag = (
+                markdown.startswith("<td", tag_start)
+                and markdown.find(">", tag_start, i) < 0
+                and not (markdown[i - 1].isalnum() or markdown[i - 1] == "_")
+            )
+            if in_td_tag:
+                body_start = markdown.find(">", i + len(needle)) + 1
+                body_end = markdown.find("</td>", body_start)
+                if body_start and body_end >= 0:
+                    return markdown[body_start:body_end]
+            i = markdown.find(needle, i + 1)
+    return None
 
 def get_spreadsheet_cell(file_path: str, cell_id: str) -> str:
-    client = LandingAIADE()
-    response = client.parse(document=Path(file_path))
+    return get_spreadsheet_cell_from_sheets(sheet_index(file_path), cell_id)
 
-    tables = [c for c in response.chunks if c.type == "table"]
-    if not tables:
+def get_spreadsheet_cell_from_sheets(sheets: dict[str, list], cell_id: str) -> str:
+    if not sheets:
         raise ValueError("No tables found in spreadsheet")
 
-    # Search all table chunks for the cell ID
-    for table in tables:
-        cell_text = {}
-        for m in re.finditer(
-            r'<td[^>]*\bid=["\']([^"\']+)["\'][^>]*>(.*?)</td>',
-            table.markdown,
-            re.DOTALL,
-        ):
-            cell_text[m.group(1)] = re.sub(r"<[^>]+>", "", m.group(2)).strip()
-
-        if cell_id in cell_text:
-            return cell_text[cell_id]
-
-    available = []
-    for table in tables:
-        for m in re.finditer(r'<td[^>]*\bid=["\']([^"\']+)["\']', table.markdown):
-            available.append(m.group(1))
-    raise KeyError(f"Cell '{cell_id}' not found. Available IDs: {available[:10]}...")
+    # Search the chunks of the named sheet first; the remaining chunks are
+    # only reached on a miss
+    sheet = cell_id.rpartition("-")[0]
+    others = (t for name, ts in sheets.items() if name != sheet for t in ts)
+    for table in chain(sheets.get(sheet, ()), others):
+        cell_html = _find_cell_html(table.markdown, cell_id)
+        if cell_html is not None:
+            return _clean(cell_html)
+
+    # Only the first few IDs are shown, so stop scanning once we have them
+    tables = chain.from_iterable(sheets.values())
+    ids = (m.group(1) for table in tables for m in _TD_ID_ONLY_RE.finditer(table.markdown))
+    available = list(islice(ids, 10))
+    raise KeyError(f"Cell '{cell_id}' not found. Available IDs: {available}...")
+
+def _repl(file_path: str) -> None:
+    sheets = sheet_index(file_path)
+    for line in sys.stdin:
+        cell_id = line.strip()
+        if not cell_id:
+            continue
+        try:
+            value = get_spreadsheet_cell_from_sheets(sheets, cell_id)
+        except (ValueError, KeyError) as e:
+            print(f"Error: {e}", file=sys.stderr, flush=True)
+            continue
+        print(f"{cell_id}: {value}", flush=True)
 
 if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[2] == "--repl":
+        _repl(sys.argv[1])
+        sys.exit(0)
     if len(sys.argv) < 3:
         print(__doc__)
         sys.exit(1)